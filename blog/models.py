@@ -1,6 +1,7 @@
 # blog/models.py
 from django.db import models
 from django.utils.text import slugify
+from dfaker.resolvers import derived
 
 class Category(models.Model):
     name = models.CharField(max_length=100)
@@ -10,9 +11,8 @@ class Category(models.Model):
         'len': 10,
         'fields': {
             'name': ['Tech', 'Food', 'Sport', 'Travel', 'Music'],
-            # Pour le slug, on peut aussi le forcer via une lambda pour qu'il corresponde au nom
-            # (Note: c'est complexe de lier les deux ici, mieux vaut utiliser les signaux Django pre_save)
-            'slug': lambda f: f.slug() 
+            # Le slug est dérivé du nom de la ligne en cours de construction
+            'slug': derived(lambda f, row: slugify(row['name']))
         }
     }
 
@@ -0,0 +1,143 @@
+from typing import Dict, List, Type, Union
+from django.db import models, IntegrityError
+
+
+# Lignes insérées (puis annulées) avec les index en place pour estimer le gain
+PROBE_SIZE = 500
+
+class FastLoader:
+    """
+    Classe de base pour le mode --fast-load : on charge sans index secondaires
+    ni contrôles de FK, puis on reconstruit et on valide en une passe.
+    """
+    def __init__(self, connection):
+        self.connection = connection
+
+    def setup(self):
+        """Appelée HORS transaction, avant le chargement"""
+        pass
+
+    def defer_constraints(self):
+        """Appelée au début de la transaction"""
+        pass
+
+    def get_index_sql(self, cursor, table: str) -> Dict[str, str]:
+        """Retourne {nom_index: sql_de_création} des index secondaires supprimables"""
+        raise NotImplementedError("Implement get_index_sql()")
+
+    def drop_indexes(self, model: models.Model) -> List[str]:
+        """Supprime les index secondaires et retourne le SQL pour les recréer"""
+        table = model._meta.db_table
+        with self.connection.cursor() as cursor:
+            indexes = self.get_index_sql(cursor, table)
+            for name in indexes:
+                cursor.execute(f"DROP INDEX {self.connection.ops.quote_name(name)}")
+        return list(indexes.values())
+
+    def restore_indexes(self, statements: List[str]):
+        with self.connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+    def validate(self, models_list: List[models.Model]) -> List[str]:
+        """Vérifie l'intégrité référentielle, retourne la liste des erreurs"""
+        return []
+
+    def teardown(self):
+        """Appelée HORS transaction, après le chargement (même en cas d'erreur)"""
+        pass
+
+# --- Implémentations spécifiques ---
+
+class SQLiteFastLoader(FastLoader):
+    PRAGMAS = {
+        'foreign_keys': 'OFF',
+        'synchronous': 'OFF',
+        'journal_mode': 'MEMORY',
+    }
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.previous = {}
+
+    def setup(self):
+        # Les PRAGMA sont ignorés à l'intérieur d'une transaction
+        with self.connection.cursor() as cursor:
+            for pragma, value in self.PRAGMAS.items():
+                cursor.execute(f"PRAGMA {pragma}")
+                self.previous[pragma] = cursor.fetchone()[0]
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+
+    def get_index_sql(self, cursor, table):
+        # Les index implicites (sqlite_autoindex_*) n'ont pas de SQL et ne peuvent être supprimés.
+        # Les index UNIQUE (unique_together, UniqueConstraint) portent une contrainte : on les garde.
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s "
+            "AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%%'",
+            [table],
+        )
+        return dict(cursor.fetchall())
+
+    def validate(self, models_list):
+        errors = []
+        with self.connection.cursor() as cursor:
+            for model in models_list:
+                table = model._meta.db_table
+                cursor.execute(f"PRAGMA foreign_key_check({self.connection.ops.quote_name(table)})")
+                violations = cursor.fetchall()
+                if violations:
+                    errors.append(f"{model.__name__} : {len(violations)} lignes avec une FK invalide")
+        return errors
+
+    def teardown(self):
+        with self.connection.cursor() as cursor:
+            for pragma, value in self.previous.items():
+                cursor.execute(f"PRAGMA {pragma} = {value}")
+        self.previous = {}
+
+class PostgresFastLoader(FastLoader):
+    def defer_constraints(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute("SET CONSTRAINTS ALL DEFERRED")
+            cursor.execute("SET LOCAL synchronous_commit TO OFF")
+
+    def get_index_sql(self, cursor, table):
+        # On garde la clé primaire, les index uniques (y compris partiels ou sur
+        # expression, sans ligne dans pg_constraint) et ceux portés par une contrainte
+        cursor.execute(
+            """
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            JOIN pg_class t ON t.oid = x.indrelid
+            WHERE t.relname = %s
+              AND t.relnamespace = to_regnamespace(current_schema())
+              AND NOT x.indisprimary
+              AND NOT x.indisunique
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+            """,
+            [table],
+        )
+        return dict(cursor.fetchall())
+
+    def validate(self, models_list):
+        # Les FK Django sont DEFERRABLE : les rendre immédiates les vérifie toutes d'un coup
+        try:
+            with self.connection.cursor() as cursor:
+                cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+        except IntegrityError as e:
+            return [str(e)]
+        return []
+
+# --- Mapping ---
+LOADER_REGISTRY: Dict[str, Type[FastLoader]] = {
+    "sqlite": SQLiteFastLoader,
+    "postgresql": PostgresFastLoader,
+}
+
+def get_fast_loader(connection) -> Union[FastLoader, None]:
+    loader_class: FastLoader = LOADER_REGISTRY.get(connection.vendor, None)
+    if loader_class:
+        return loader_class(connection)
+
+    return None
@@ -0,0 +1,107 @@
+from typing import Dict, List, Any
+from django.db import models
+from ._field import ForeignKey, FieldGenerator
+
+
+# Nombre de lignes générées (sans écriture) pour extrapoler les coûts
+PLAN_SAMPLE_SIZE = 200
+
+# En-tête de ligne approximatif côté base (SQLite / Postgres)
+ROW_OVERHEAD = 24
+
+# Taille en octets des colonnes à largeur fixe
+FIXED_SIZES: Dict[str, int] = {
+    "AutoField": 4,
+    "BigAutoField": 8,
+    "BooleanField": 1,
+    "SmallIntegerField": 2,
+    "IntegerField": 4,
+    "PositiveIntegerField": 4,
+    "BigIntegerField": 8,
+    "FloatField": 8,
+    "DateField": 4,
+    "DateTimeField": 8,
+    "UUIDField": 16,
+    "ForeignKey": 8,
+    "OneToOneField": 8,
+}
+
+def estimate_value_size(field: models.Field, value: Any) -> int:
+    if value is None:
+        return 0
+    size = FIXED_SIZES.get(field.get_internal_type())
+    if size is not None:
+        return size
+    return len(str(value).encode('utf-8'))
+
+def estimate_row_size(model: models.Model, rows: List[Dict[str, Any]]) -> float:
+    """
+    Taille moyenne d'une ligne (index inclus) à partir des valeurs réellement
+    générées et du type des colonnes.
+    """
+    if not rows:
+        return 0
+
+    total = 0
+    for data in rows:
+        total += ROW_OVERHEAD
+        for field in model._meta.concrete_fields:
+            if field.primary_key:
+                total += FIXED_SIZES.get(field.get_internal_type(), 8)
+                continue
+            size = estimate_value_size(field, data.get(field.attname))
+            total += size
+            # Les colonnes indexées sont stockées une seconde fois dans l'index
+            if field.unique or field.db_index:
+                total += size
+
+    return total / len(rows)
+
+def check_fk_pools(model: models.Model, total_count: int, generators: Dict[str, FieldGenerator], projected: Dict[models.Model, int]) -> List[str]:
+    """
+    Vérifie que chaque FK disposera d'assez d'IDs parents, en comptant les
+    lignes existantes et celles qui seront créées avant ce modèle.
+    """
+    warnings = []
+    for generator in generators.values():
+        if not isinstance(generator, ForeignKey):
+            continue
+
+        field = generator.field
+        related: models.Model = field.related_model
+        available = related.objects.count() + projected.get(related, 0)
+
+        if generator.is_unique:
+            used = model.objects.exclude(**{f"{field.name}": None}).count()
+            needed = total_count
+            available -= used
+        else:
+            needed = 1
+
+        if needed > available and not field.null:
+            warnings.append(
+                f"{model.__name__}.{field.name} : {needed} IDs de {related.__name__} "
+                f"nécessaires, {max(available, 0)} disponibles."
+            )
+
+    return warnings
+
+def fill_fk_placeholders(generators: Dict[str, FieldGenerator], projected: Dict[models.Model, int]):
+    """
+    Les parents planifiés n'existent pas encore en base : on complète le pool
+    de chaque FK avec des IDs fictifs (négatifs, sans collision avec les vrais)
+    pour que l'échantillon passe par le vrai chemin de generate().
+    """
+    for generator in generators.values():
+        if not isinstance(generator, ForeignKey):
+            continue
+
+        count = projected.get(generator.field.related_model, 0)
+        generator.related_ids.extend(range(-count, 0))
+
+def format_bytes(size: float) -> str:
+    for unit in ('o', 'Ko', 'Mo', 'Go'):
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} To"
@@ -0,0 +1,217 @@
+from typing import Dict, List, Type, Union, Any
+import hashlib
+import inspect
+import io
+import json
+import os
+import zipfile
+from django.conf import settings
+from django.core.management.color import no_style
+from django.db import models, transaction
+from faker import VERSION as FAKER_VERSION
+from dfaker.resolvers import Resolver
+
+
+# Budget disque par défaut du cache (512 Mo)
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+def _fingerprint(value: Any) -> Any:
+    """Représentation stable (entre deux processus) d'une valeur de faker_seed"""
+    if isinstance(value, Resolver):
+        # Le pool est un cache rempli par prepare(), il ne fait pas partie de la config
+        attrs = {k: v for k, v in vars(value).items() if k != 'pool'}
+        return [type(value).__name__, _fingerprint(attrs)]
+    if callable(value):
+        try:
+            return inspect.getsource(value).strip()
+        except (OSError, TypeError):
+            return getattr(value, '__qualname__', repr(value))
+    if isinstance(value, dict):
+        return {str(k): _fingerprint(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple)):
+        return [_fingerprint(v) for v in value]
+    return repr(value)
+
+def compute_snapshot_key(connection, models_list: List[models.Model], seed: Union[int, None]) -> str:
+    """
+    Hash des entrées du seed : configs faker_seed, schéma des tables, état
+    initial (nombre de lignes de chaque table), graine aléatoire et version de
+    Faker (une même graine ne produit pas les mêmes données d'une version à l'autre).
+    """
+    inputs = {'vendor': connection.vendor, 'seed': seed, 'faker': FAKER_VERSION, 'tables': {}, 'models': []}
+    with connection.cursor() as cursor:
+        for table in sorted(connection.introspection.table_names(cursor)):
+            cursor.execute(f"SELECT COUNT(*) FROM {connection.ops.quote_name(table)}")
+            inputs['tables'][table] = cursor.fetchone()[0]
+
+    for model in models_list:
+        inputs['models'].append({
+            'model': model._meta.label,
+            'table': model._meta.db_table,
+            'columns': [
+                [field.attname, field.db_type(connection), field.null, field.unique]
+                for field in model._meta.concrete_fields
+            ],
+            'faker_seed': _fingerprint(getattr(model, 'faker_seed', {})),
+        })
+
+    payload = json.dumps(inputs, sort_keys=True).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+class SnapshotStore:
+    """Classe de base du cache de snapshots, avec éviction LRU sur la date d'accès"""
+    extension = ''
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.directory = str(getattr(
+            settings, 'DFAKER_SNAPSHOT_DIR',
+            os.path.join(getattr(settings, 'BASE_DIR', os.getcwd()), '.dfaker_snapshots'),
+        ))
+        self.max_size = getattr(settings, 'DFAKER_SNAPSHOT_MAX_SIZE', DEFAULT_MAX_SIZE)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}{self.extension}")
+
+    def dump(self, path: str, models_list: List[models.Model]):
+        raise NotImplementedError("Implement dump()")
+
+    def load(self, path: str, models_list: List[models.Model]):
+        raise NotImplementedError("Implement load()")
+
+    def restore(self, key: str, models_list: List[models.Model]) -> bool:
+        path = self.path(key)
+        if not os.path.exists(path):
+            return False
+
+        self.load(path, models_list)
+        # On rafraîchit la date pour l'éviction LRU
+        os.utime(path)
+        return True
+
+    def store(self, key: str, models_list: List[models.Model]):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            self.dump(tmp_path, models_list)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict()
+
+    def evict(self):
+        entries = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith(self.extension)
+        ]
+        entries.sort(key=os.path.getmtime)
+        total = sum(os.path.getsize(path) for path in entries)
+
+        # Les plus anciens d'abord, on garde toujours le plus récent
+        while entries[:-1] and total > self.max_size:
+            path = entries.pop(0)
+            total -= os.path.getsize(path)
+            os.remove(path)
+
+# --- Implémentations spécifiques ---
+
+class SQLiteSnapshotStore(SnapshotStore):
+    extension = '.sqlite3'
+
+    def dump(self, path, models_list):
+        # Seules les tables seedées sont copiées : ce sont les seules que load() restaure
+        quote = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute("ATTACH DATABASE %s AS snapshot", [path])
+            try:
+                for model in models_list:
+                    table = quote(model._meta.db_table)
+                    columns = ", ".join(quote(f.column) for f in model._meta.concrete_fields)
+                    cursor.execute(f"CREATE TABLE snapshot.{table} AS SELECT {columns} FROM {table}")
+            finally:
+                cursor.execute("DETACH DATABASE snapshot")
+
+    def load(self, path, models_list):
+        # Seules les tables seedées sont remplacées : le reste de la base n'est pas touché.
+        # ATTACH est interdit dans une transaction, d'où l'ordre des blocs.
+        quote = self.connection.ops.quote_name
+        with self.connection.cursor() as cursor:
+            cursor.execute("ATTACH DATABASE %s AS snapshot", [path])
+            try:
+                with transaction.atomic(using=self.connection.alias):
+                    for model in reversed(models_list):
+                        cursor.execute(f"DELETE FROM {quote(model._meta.db_table)}")
+                    for model in models_list:
+                        table = quote(model._meta.db_table)
+                        columns = ", ".join(quote(f.column) for f in model._meta.concrete_fields)
+                        cursor.execute(
+                            f"INSERT INTO {table} ({columns}) SELECT {columns} FROM snapshot.{table}"
+                        )
+            finally:
+                cursor.execute("DETACH DATABASE snapshot")
+
+class PostgresSnapshotStore(SnapshotStore):
+    """
+    Archive des seules tables seedées, une entrée COPY par table. La
+    restauration passe par la connexion Django, dans une seule transaction.
+    """
+    extension = '.zip'
+
+    def _copy_sql(self, model: models.Model, direction: str) -> str:
+        quote = self.connection.ops.quote_name
+        columns = ", ".join(quote(f.column) for f in model._meta.concrete_fields)
+        return f"COPY {quote(model._meta.db_table)} ({columns}) {direction}"
+
+    def _copy_out(self, cursor, sql: str) -> bytes:
+        if hasattr(cursor, 'copy'):
+            # psycopg 3
+            with cursor.copy(sql) as copy:
+                return b"".join(bytes(chunk) for chunk in copy)
+        # psycopg2
+        buffer = io.BytesIO()
+        cursor.copy_expert(sql, buffer)
+        return buffer.getvalue()
+
+    def _copy_in(self, cursor, sql: str, data: bytes):
+        if hasattr(cursor, 'copy'):
+            with cursor.copy(sql) as copy:
+                copy.write(data)
+        else:
+            cursor.copy_expert(sql, io.BytesIO(data))
+
+    def dump(self, path, models_list):
+        with self.connection.cursor() as cursor, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for model in models_list:
+                archive.writestr(model._meta.db_table, self._copy_out(cursor.cursor, self._copy_sql(model, "TO STDOUT")))
+
+    def load(self, path, models_list):
+        quote = self.connection.ops.quote_name
+        with zipfile.ZipFile(path) as archive, transaction.atomic(using=self.connection.alias):
+            with self.connection.cursor() as cursor:
+                # Les FK Django sont DEFERRABLE INITIALLY DEFERRED : vérifiées au commit.
+                # DELETE plutôt que TRUNCATE, qui refuse toute table référencée par une autre.
+                for model in reversed(models_list):
+                    cursor.execute(f"DELETE FROM {quote(model._meta.db_table)}")
+                for model in models_list:
+                    data = archive.read(model._meta.db_table)
+                    self._copy_in(cursor.cursor, self._copy_sql(model, "FROM STDIN"), data)
+
+                # Les séquences des PK doivent repartir après les IDs restaurés
+                for sql in self.connection.ops.sequence_reset_sql(no_style(), models_list):
+                    cursor.execute(sql)
+
+# --- Mapping ---
+SNAPSHOT_REGISTRY: Dict[str, Type[SnapshotStore]] = {
+    "sqlite": SQLiteSnapshotStore,
+    "postgresql": PostgresSnapshotStore,
+}
+
+def get_snapshot_store(connection) -> Union[SnapshotStore, None]:
+    store_class: SnapshotStore = SNAPSHOT_REGISTRY.get(connection.vendor, None)
+    if store_class:
+        return store_class(connection)
+
+    return None
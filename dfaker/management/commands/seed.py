@@ -1,10 +1,16 @@
 import time
 import random
+import tracemalloc
 from typing import List, Dict, Set, Any
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.apps import apps
-from django.db import transaction, models
+from django.db import transaction, models, connection
+from faker import Faker
 from ._field import get_generator, FieldGenerator, fake
+from ._fastload import PROBE_SIZE, get_fast_loader, FastLoader
+from ._snapshot import get_snapshot_store, compute_snapshot_key
+from ._plan import PLAN_SAMPLE_SIZE, estimate_row_size, check_fk_pools, fill_fk_placeholders, format_bytes
+from dfaker.resolvers import Resolver, get_resolver
 
 
 BATCH_SIZE = 2000
@@ -12,16 +18,95 @@ BATCH_SIZE = 2000
 class Command(BaseCommand):
     help = 'Génère des fausses données optimisées'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--plan',
+            action='store_true',
+            help="Estime durée, taille et RAM par modèle sans rien écrire en base",
+        )
+        parser.add_argument(
+            '--fast-load',
+            action='store_true',
+            help="Supprime index secondaires et contrôles de FK pendant le chargement, puis les reconstruit",
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=None,
+            help="Graine aléatoire (Faker et random) pour un jeu de données reproductible",
+        )
+        parser.add_argument(
+            '--snapshot',
+            action='store_true',
+            help="Restaure un snapshot si les entrées du seed sont identiques, sinon en crée un (nécessite --seed)",
+        )
+
     def handle(self, *args, **kwargs):
         start = time.time()
         
         # 1. Récupération et Tri des modèles (Gestion des dépendances)
         models_list = self.get_sorted_models()
+
+        if kwargs['seed'] is not None:
+            Faker.seed(kwargs['seed'])
+            random.seed(kwargs['seed'])
+
+        if kwargs['plan']:
+            self.plan(models_list)
+            return
         
-        # 2. Création des données
-        with transaction.atomic():
-            for model in models_list:
-                self.process_model(model)
+        # 2. Restauration depuis le cache si les entrées n'ont pas changé
+        store = get_snapshot_store(connection) if kwargs['snapshot'] else None
+        if kwargs['snapshot'] and store is None:
+            self.stderr.write(self.style.WARNING(
+                f"--snapshot non supporté pour {connection.vendor}, génération complète."
+            ))
+        # Sans graine, un snapshot rejouerait toujours le même jeu « aléatoire »
+        if store and kwargs['seed'] is None:
+            self.stderr.write(self.style.WARNING(
+                "--snapshot ignoré sans --seed, génération complète."
+            ))
+            store = None
+
+        if store:
+            snapshot_key = compute_snapshot_key(connection, models_list, kwargs['seed'])
+            try:
+                restored = store.restore(snapshot_key, models_list)
+            except Exception as e:
+                self.stderr.write(self.style.WARNING(
+                    f"Restauration du snapshot {snapshot_key[:12]} impossible, génération complète: {e}"
+                ))
+                restored = False
+
+            if restored:
+                end = time.time()
+                self.stdout.write(self.style.SUCCESS(
+                    f"Snapshot {snapshot_key[:12]} restauré en {end - start:.2f}s"
+                ))
+                return
+
+        # 3. Création des données
+        loader = get_fast_loader(connection) if kwargs['fast_load'] else None
+        if kwargs['fast_load'] and loader is None:
+            self.stderr.write(self.style.WARNING(
+                f"--fast-load non supporté pour {connection.vendor}, chargement standard."
+            ))
+
+        if loader:
+            self.fast_load(loader, models_list)
+        else:
+            with transaction.atomic():
+                for model in models_list:
+                    self.process_model(model)
+
+        if store:
+            try:
+                store.store(snapshot_key, models_list)
+                self.stdout.write(f"Snapshot {snapshot_key[:12]} enregistré")
+            except Exception as e:
+                self.stderr.write(self.style.WARNING(
+                    f"Enregistrement du snapshot {snapshot_key[:12]} impossible: {e}"
+                ))
                 
         end = time.time()
         self.stdout.write(self.style.SUCCESS(f"Temps d'exécution total: {end - start:.2f}s"))
@@ -66,11 +151,12 @@ class Command(BaseCommand):
             return
 
         total_count = faker_config.get('len', 0)
-        custom_fields: Dict[str, Any] = faker_config.get('fields', {})
         
         if total_count <= 0:
             return
 
+        custom_fields: Dict[str, Resolver] = self._get_resolvers(faker_config.get('fields', {}))
+
         model_name = model.__name__
         self.stdout.write(f'Traitement de {model_name} ({total_count} objets)...')
 
@@ -82,36 +168,196 @@ class Command(BaseCommand):
         for start in range(0, total_count, BATCH_SIZE):
             batch_size = min(BATCH_SIZE, total_count - start)
             objs_buffer = [
-                model(**self._get_data(model, generators, custom_fields))
-                for _ in range(batch_size)
+                model(**data)
+                for data in self._get_batch_data(model, generators, custom_fields, batch_size)
             ]
             self._bulk_write(model, objs_buffer)
         
         self.stdout.write(self.style.SUCCESS(f' -> Terminé pour {model_name}'))
 
-    def _get_data(self, model: models.Model, generators: Dict[str, FieldGenerator], custom_fields: Dict[str, Any]):
-        data = {}        
-        for field_name, generator in generators.items():
-            clean_name = field_name.replace('_id', '')
-            if clean_name in custom_fields: continue
+    def fast_load(self, loader: FastLoader, models_list: List[models.Model]):
+        """
+        Charge chaque modèle sans ses index secondaires, les reconstruit juste
+        après, puis valide l'intégrité référentielle en une seule passe.
+        """
+        load_time = rebuild_time = 0
+        fast_times: Dict[models.Model, float] = {}
+
+        loader.setup()
+        try:
+            with transaction.atomic():
+                loader.defer_constraints()
+
+                for model in models_list:
+                    t0 = time.perf_counter()
+                    statements = loader.drop_indexes(model)
+                    self.process_model(model)
+                    t1 = time.perf_counter()
+                    try:
+                        loader.restore_indexes(statements)
+                    except Exception as e:
+                        raise CommandError(f"Reconstruction des index de {model.__name__} impossible: {e}") from e
+                    t2 = time.perf_counter()
+
+                    load_time += t1 - t0
+                    rebuild_time += t2 - t1
+                    fast_times[model] = t2 - t0
+                    self.stdout.write(f' -> {len(statements)} index reconstruits en {t2 - t1:.2f}s')
+
+                t0 = time.perf_counter()
+                errors = loader.validate(models_list)
+                if errors:
+                    raise CommandError("Intégrité invalide: " + "; ".join(errors))
+                validate_time = time.perf_counter() - t0
+
+                # Mesuré en dernier : les tirages de l'échantillon ne décalent pas le RNG (--seed)
+                indexed_times = self.estimate_indexed_load(models_list)
+        finally:
+            loader.teardown()
+
+        self.stdout.write(
+            f"Fast-load : chargement {load_time:.2f}s, index {rebuild_time:.2f}s, "
+            f"validation {validate_time:.2f}s"
+        )
+        if indexed_times:
+            indexed_total = sum(indexed_times.values())
+            fast_total = sum(fast_times[model] for model in indexed_times) + validate_time
+            self.stdout.write(
+                f"Chargement standard estimé ~{indexed_total:.2f}s, "
+                f"gain estimé ~{indexed_total - fast_total:.2f}s"
+            )
+        skipped = [model.__name__ for model in fast_times if model not in indexed_times]
+        if skipped:
+            self.stdout.write(f"Gain non estimé pour : {', '.join(skipped)}")
+
+    def estimate_indexed_load(self, models_list: List[models.Model]) -> Dict[models.Model, float]:
+        """
+        Pour chaque modèle, insère un échantillon avec tous les index en place
+        dans un savepoint annulé, puis extrapole au nombre total de lignes.
+        """
+        estimates: Dict[models.Model, float] = {}
+
+        for model in models_list:
+            faker_config = getattr(model, 'faker_seed', {})
+            if not isinstance(faker_config, dict) or faker_config.get('len', 0) <= 0:
+                continue
+
+            total_count = faker_config['len']
+            sample_size = min(PROBE_SIZE, total_count)
+
             try:
-                data[field_name] = generator.generate()
+                with transaction.atomic():
+                    custom_fields: Dict[str, Resolver] = self._get_resolvers(faker_config.get('fields', {}))
+                    generators: Dict[str, FieldGenerator] = self._get_generators(model)
+
+                    t0 = time.perf_counter()
+                    objs = [model(**data) for data in self._get_batch_data(model, generators, custom_fields, sample_size)]
+                    model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+                    estimates[model] = (time.perf_counter() - t0) / sample_size * total_count
+
+                    # L'échantillon ne doit pas rester en base
+                    transaction.set_rollback(True)
             except Exception:
+                # Ex. : FK unique dont tous les parents sont déjà liés, pas d'échantillon possible
                 pass
 
-        for field_name, resolver in custom_fields.items():
+        return estimates
+
+    def plan(self, models_list: List[models.Model]):
+        """
+        Simule le seed : génère un échantillon par modèle via les vrais
+        générateurs et extrapole les coûts, sans aucune écriture.
+        """
+        projected: Dict[models.Model, int] = {}
+        total_time = total_size = peak_ram = 0
+        warnings = []
+
+        for model in models_list:
+            faker_config = getattr(model, 'faker_seed', {})
+            if not isinstance(faker_config, dict):
+                continue
+
+            total_count = faker_config.get('len', 0)
+            if total_count <= 0:
+                continue
+
+            custom_fields: Dict[str, Resolver] = self._get_resolvers(faker_config.get('fields', {}))
+            generators: Dict[str, FieldGenerator] = self._get_generators(model)
+            sample_size = min(PLAN_SAMPLE_SIZE, total_count)
+
+            fk_generators = {k: g for k, g in generators.items() if k.replace('_id', '') not in custom_fields}
+            warnings += check_fk_pools(model, total_count, fk_generators, projected)
+            fill_fk_placeholders(fk_generators, projected)
+
+            t0 = time.perf_counter()
+            rows = self._get_batch_data(model, generators, custom_fields, sample_size)
+            [model(**data) for data in rows]
+            duration = (time.perf_counter() - t0) / sample_size * total_count
+
+            # Passe séparée : tracemalloc fausserait la mesure du temps
+            tracemalloc.start()
+            objs_sample = [model(**data) for data in self._get_batch_data(model, generators, custom_fields, sample_size)]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del objs_sample
+            ram = peak / sample_size * min(BATCH_SIZE, total_count)
+
+            size = estimate_row_size(model, rows) * total_count
+
+            self.stdout.write(
+                f"{model.__name__} ({total_count} objets) : ~{duration:.2f}s, "
+                f"+{format_bytes(size)} en base, pic RAM ~{format_bytes(ram)}"
+            )
+
+            projected[model] = total_count
+            total_time += duration
+            total_size += size
+            peak_ram = max(peak_ram, ram)
+
+        fake.unique.clear()
+
+        for warning in warnings:
+            self.stdout.write(self.style.WARNING(f"Pool FK insuffisant : {warning}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Estimation totale (génération seule) : ~{total_time:.2f}s, "
+            f"+{format_bytes(total_size)} en base, pic RAM ~{format_bytes(peak_ram)}"
+        ))
+
+    def _get_batch_data(self, model: models.Model, generators: Dict[str, FieldGenerator], custom_fields: Dict[str, Resolver], batch_size: int):
+        rows = []
+        for _ in range(batch_size):
+            data = {}
+            for field_name, generator in generators.items():
+                clean_name = field_name.replace('_id', '')
+                if clean_name in custom_fields: continue
+                try:
+                    data[field_name] = generator.generate()
+                except Exception:
+                    pass
+            rows.append(data)
+
+        # Les résolveurs dérivés passent en dernier pour voir la ligne complète
+        ordered = sorted(custom_fields.items(), key=lambda item: item[1].derived)
+        for field_name, resolver in ordered:
             target_key = field_name
             if hasattr(model, f"{field_name}_id"):
                 target_key = f"{field_name}_id"
 
-            if callable(resolver):
-                data[target_key] = resolver(fake)
-            elif isinstance(resolver, list):
-                data[target_key] = random.choice(resolver)
-            else:
-                data[target_key] = resolver
-            
-        return data
+            for data, value in zip(rows, resolver.generate_batch(fake, rows)):
+                data[target_key] = value
+
+        return rows
+
+    def _get_resolvers(self, custom_fields: Dict[str, Any]):
+        resolvers: Dict[str, Resolver] = {}
+
+        for field_name, value in custom_fields.items():
+            resolver = get_resolver(value)
+            resolver.prepare(fake)
+            resolvers[field_name] = resolver
+
+        return resolvers
     
     def _get_generators(self, model: models.Model):
         generators: Dict[str, FieldGenerator] = {}
@@ -0,0 +1,117 @@
+from typing import Any, Callable, Dict, List
+import random
+
+
+class Resolver:
+    """Classe de base pour les résolveurs personnalisés de faker_seed['fields']"""
+    # Les résolveurs dérivés sont évalués après tous les autres champs de la ligne
+    derived = False
+
+    def prepare(self, fake):
+        """Méthode appelée une seule fois par modèle avant la boucle de génération"""
+        pass
+
+    def generate_batch(self, fake, rows: List[Dict[str, Any]]) -> List[Any]:
+        """Retourne une valeur par ligne du lot"""
+        raise NotImplementedError("Implement generate_batch()")
+
+# --- Implémentations spécifiques ---
+
+class ConstantResolver(Resolver):
+    def __init__(self, value: Any):
+        self.value = value
+
+    def generate_batch(self, fake, rows):
+        return [self.value] * len(rows)
+
+class ChoiceResolver(Resolver):
+    def __init__(self, choices: List[Any]):
+        self.choices = choices
+
+    def generate_batch(self, fake, rows):
+        return random.choices(self.choices, k=len(rows))
+
+class CallableResolver(Resolver):
+    """Résolveur historique : `lambda f: ...` appelé une fois par ligne"""
+    def __init__(self, func: Callable):
+        self.func = func
+
+    def generate_batch(self, fake, rows):
+        return [self.func(fake) for _ in rows]
+
+class BatchResolver(Resolver):
+    """`lambda f, n: [...]` appelé une seule fois par lot"""
+    def __init__(self, func: Callable):
+        self.func = func
+
+    def generate_batch(self, fake, rows):
+        values = list(self.func(fake, len(rows)))
+        if len(values) != len(rows):
+            raise ValueError(
+                f"Le résolveur batch a retourné {len(values)} valeurs au lieu de {len(rows)}."
+            )
+        return values
+
+class PooledResolver(Resolver):
+    """Génère `size` valeurs distinctes une seule fois, puis tire dedans"""
+    def __init__(self, func: Callable, size: int):
+        self.func = func
+        self.size = size
+        self.pool = []
+
+    def prepare(self, fake):
+        pool = []
+        seen = set()
+        # On borne les tentatives : le générateur peut avoir moins de `size` valeurs possibles
+        for _ in range(self.size * 10):
+            if len(pool) >= self.size:
+                break
+            value = self.func(fake)
+            try:
+                if value in seen:
+                    continue
+                seen.add(value)
+            except TypeError:
+                # Valeur non hachable (dict, list) : comparaison par égalité
+                if value in pool:
+                    continue
+            pool.append(value)
+
+        if not pool:
+            raise ValueError(f"Le résolveur pooled n'a produit aucune valeur (size={self.size}).")
+        self.pool = pool
+
+    def generate_batch(self, fake, rows):
+        return random.choices(self.pool, k=len(rows))
+
+class DerivedResolver(Resolver):
+    """`lambda f, row: ...` qui voit la ligne en cours de construction"""
+    derived = True
+
+    def __init__(self, func: Callable):
+        self.func = func
+
+    def generate_batch(self, fake, rows):
+        return [self.func(fake, row) for row in rows]
+
+# --- Décorateurs ---
+
+def batch(func: Callable) -> BatchResolver:
+    return BatchResolver(func)
+
+def pooled(func: Callable = None, *, size: int = 100):
+    if func is None:
+        return lambda f: PooledResolver(f, size)
+    return PooledResolver(func, size)
+
+def derived(func: Callable) -> DerivedResolver:
+    return DerivedResolver(func)
+
+def get_resolver(value: Any) -> Resolver:
+    if isinstance(value, Resolver):
+        return value
+    if callable(value):
+        return CallableResolver(value)
+    if isinstance(value, list):
+        return ChoiceResolver(value)
+    return ConstantResolver(value)
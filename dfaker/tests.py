@@ -1,3 +1,141 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from blog.models import Category
+from ecom.models import Product
+from dfaker.management.commands._fastload import get_fast_loader
+from dfaker.management.commands._field import fake
+from dfaker.management.commands._snapshot import get_snapshot_store
+from dfaker.management.commands.seed import Command
+from dfaker.resolvers import (
+    BatchResolver, CallableResolver, ChoiceResolver, ConstantResolver,
+    DerivedResolver, PooledResolver, batch, derived, get_resolver, pooled,
+)
+
+
+class GetResolverTests(TestCase):
+    def test_dispatch(self):
+        self.assertIsInstance(get_resolver(lambda f: 1), CallableResolver)
+        self.assertIsInstance(get_resolver(['a', 'b']), ChoiceResolver)
+        self.assertIsInstance(get_resolver(True), ConstantResolver)
+        self.assertIsInstance(get_resolver(batch(lambda f, n: [0] * n)), BatchResolver)
+        self.assertIsInstance(get_resolver(pooled(lambda f: 1, size=1)), PooledResolver)
+        self.assertIsInstance(get_resolver(derived(lambda f, row: 1)), DerivedResolver)
+
+    def test_resolver_is_returned_as_is(self):
+        resolver = batch(lambda f, n: [0] * n)
+        self.assertIs(get_resolver(resolver), resolver)
+
+
+class PooledResolverTests(TestCase):
+    def test_pool_is_distinct_and_bounded(self):
+        resolver = pooled(lambda f: f.random_int(min=1, max=3), size=10)
+        resolver.prepare(fake)
+        self.assertLessEqual(len(resolver.pool), 3)
+        self.assertEqual(len(resolver.pool), len(set(resolver.pool)))
+
+    def test_unhashable_values(self):
+        resolver = pooled(lambda f: {'n': f.random_int(min=1, max=2)}, size=5)
+        resolver.prepare(fake)
+        self.assertTrue(all(isinstance(value, dict) for value in resolver.pool))
+
+    def test_empty_pool_raises(self):
+        with self.assertRaises(ValueError):
+            pooled(lambda f: 1, size=0).prepare(fake)
+
+
+class BatchDataTests(TestCase):
+    def setUp(self):
+        self.command = Command()
+
+    def get_rows(self, fields, count):
+        resolvers = self.command._get_resolvers(fields)
+        return self.command._get_batch_data(Category, {}, resolvers, count)
+
+    def test_batch_resolver_called_once_per_batch(self):
+        calls = []
+
+        def names(f, n):
+            calls.append(n)
+            return [f"name-{i}" for i in range(n)]
+
+        rows = self.get_rows({'name': batch(names)}, 5)
+        self.assertEqual(calls, [5])
+        self.assertEqual([row['name'] for row in rows], [f"name-{i}" for i in range(5)])
+
+    def test_batch_resolver_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.get_rows({'name': batch(lambda f, n: ['x'])}, 3)
+
+    def test_pooled_samples_from_pool(self):
+        resolver = pooled(lambda f: f.word(), size=4)
+        rows = self.get_rows({'name': resolver}, 50)
+        self.assertTrue(all(row['name'] in resolver.pool for row in rows))
+
+    def test_derived_sees_other_fields(self):
+        # Déclaré avant 'name' : doit quand même être évalué après
+        fields = {
+            'slug': derived(lambda f, row: row['name'].lower()),
+            'name': ['Tech', 'Food'],
+        }
+        for row in self.get_rows(fields, 20):
+            self.assertEqual(row['slug'], row['name'].lower())
+
+
+class FastLoadTests(TestCase):
+    def test_unique_indexes_are_kept(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite uniquement')
+
+        loader = get_fast_loader(connection)
+        with connection.cursor() as cursor:
+            cursor.execute('CREATE UNIQUE INDEX "blog_category_slug_uniq" ON "blog_category" ("slug")')
+            cursor.execute('CREATE INDEX "blog_category_name_idx" ON "blog_category" ("name")')
+            indexes = loader.get_index_sql(cursor, 'blog_category')
+
+        self.assertIn('blog_category_name_idx', indexes)
+        self.assertNotIn('blog_category_slug_uniq', indexes)
+
+
+class SnapshotTests(TransactionTestCase):
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite uniquement')
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_restore_only_replaces_seeded_tables(self):
+        with override_settings(DFAKER_SNAPSHOT_DIR=self.directory):
+            store = get_snapshot_store(connection)
+
+        Category.objects.create(name='Tech', slug='tech')
+        store.store('key', [Category])
+
+        Category.objects.all().delete()
+        Category.objects.create(name='Food', slug='food')
+        Product.objects.create(name='p', price=1, stock=1, reference_uuid='00000000-0000-0000-0000-000000000000')
+
+        self.assertTrue(store.restore('key', [Category]))
+        self.assertEqual(list(Category.objects.values_list('name', flat=True)), ['Tech'])
+        self.assertEqual(Product.objects.count(), 1)
+
+    def test_missing_snapshot(self):
+        with override_settings(DFAKER_SNAPSHOT_DIR=self.directory):
+            store = get_snapshot_store(connection)
+        self.assertFalse(store.restore('missing', [Category]))
+
+
+class PlanTests(TestCase):
+    def test_plan_writes_nothing(self):
+        command = Command()
+        out = StringIO()
+        call_command('seed', '--plan', stdout=out)
+
+        self.assertIn('Estimation totale', out.getvalue())
+        for model in command.get_sorted_models():
+            self.assertEqual(model.objects.count(), 0, model.__name__)